@@ -0,0 +1,266 @@
+"""PriceMonitor - analitică prețuri peste istoricul scanărilor (NumPy)
+
+Istoricul e ținut pe coloane: fiecare rând = un preț de concurent dintr-o scanare.
+Toate statisticile sunt calculate vectorizat pe grupuri (SKU / concurent),
+fără bucle Python pe rânduri.
+"""
+import json
+import os
+import time
+from array import array
+from datetime import datetime
+
+import numpy as np
+
+MAD_SCALE = 1.4826      # MAD → deviație standard pentru distribuție normală
+OUTLIER_Z = 3.5         # prag z robust (Iglewicz & Hoaglin)
+MIN_HISTORY = 5         # minim de prețuri istorice ca să înlocuim banda fixă ±30%
+MIN_BAND_PCT = 0.15     # banda istorică nu e niciodată mai îngustă de ±15% din mediană
+DEFAULT_DAYS = 30
+DAY = 86400.0
+
+
+def parse_timestamp(value):
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class ScanHistory:
+    """Istoric scanări în array-uri coloane (sku, concurent, preț, prețul nostru, timp)"""
+
+    def __init__(self):
+        self.skus = []
+        self.sku_index = {}
+        self.competitors = []
+        self.comp_index = {}
+        self.your_price = {}  # ultimul preț propriu cunoscut per SKU
+        self.last_scan = {}   # ultimul snapshot complet {domeniu: preț} per SKU (fără scanări parțiale)
+        self.last_record = {}  # ultima înregistrare completă per SKU (url, metodă, timestamp)
+        # Coloane tipizate: append O(1), conversie în NumPy fără copiere
+        self._sku = array('q')
+        self._comp = array('q')
+        self._price = array('d')
+        self._ours = array('d')
+        self._ts = array('d')
+        self._arrays = None
+        # Index per SKU (preț, timp): banda unui SKU la scanare nu atinge coloanele întregului istoric
+        self.sku_prices = {}
+
+    def __len__(self):
+        return len(self._price)
+
+    def _index(self, items, index, key):
+        i = index.get(key)
+        if i is None:
+            i = index[key] = len(items)
+            items.append(key)
+        return i
+
+    def add_scan(self, scan):
+        """Adaugă o înregistrare în formatul din scans.json"""
+        sku = str(scan.get('sku', '')).strip()
+        if not sku:
+            return
+        s = self._index(self.skus, self.sku_index, sku)
+        your_price = float(scan.get('your_price') or 0)
+        if your_price > 0:
+            self.your_price[sku] = your_price
+        ts = parse_timestamp(scan.get('timestamp'))
+        self.last_record[sku] = scan
+        snapshot = {}
+        sku_prices, sku_ts = self.sku_prices.setdefault(sku, (array('d'), array('d')))
+        for comp in scan.get('competitors', []):
+            price = float(comp.get('price') or 0)
+            if price <= 0:
+                continue
+            snapshot[comp.get('name', '')] = price
+            c = self._index(self.competitors, self.comp_index, comp.get('name', ''))
+            self._sku.append(s)
+            self._comp.append(c)
+            self._price.append(price)
+            self._ours.append(your_price)
+            self._ts.append(ts)
+            sku_prices.append(price)
+            sku_ts.append(ts)
+        self._arrays = None
+        # Snapshot-ul de comparație: toți concurenții acceptați (înregistrările vechi au doar top 5);
+        # scanările parțiale sau fără căutare nu îl înlocuiesc
+        full = scan.get('snapshot', snapshot)
+        if full is not None and not scan.get('partial'):
+            self.last_scan[sku] = {name: float(price) for name, price in full.items()}
+
+    def arrays(self):
+        """(sku_idx, comp_idx, price, your_price, ts) - construite o singură dată, la cerere
+
+        Copiem bufferele ca add_scan să poată continua să scrie în coloane.
+        """
+        if self._arrays is None:
+            self._arrays = (
+                np.frombuffer(self._sku, dtype=np.int64).copy(),
+                np.frombuffer(self._comp, dtype=np.int64).copy(),
+                np.frombuffer(self._price, dtype=np.float64).copy(),
+                np.frombuffer(self._ours, dtype=np.float64).copy(),
+                np.frombuffer(self._ts, dtype=np.float64).copy(),
+            )
+        return self._arrays
+
+
+def load_history(paths):
+    """Încarcă scans.json (listă) și/sau scans.jsonl (o scanare pe linie)"""
+    history = ScanHistory()
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            if path.endswith('.jsonl'):
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        try:
+                            history.add_scan(json.loads(line))
+                        except ValueError:
+                            continue  # linie scrisă pe jumătate
+            else:
+                for scan in json.load(f):
+                    history.add_scan(scan)
+    return history
+
+
+# ============ AGREGĂRI PE GRUPURI ============
+def group_median(groups, values, n_groups):
+    """Mediana per grup; NaN pentru grupurile goale"""
+    order = np.lexsort((values, groups))
+    sorted_values = values[order]
+    counts = np.bincount(groups, minlength=n_groups)
+    starts = np.cumsum(counts) - counts
+    result = np.full(n_groups, np.nan)
+    has = counts > 0
+    lo = starts[has] + (counts[has] - 1) // 2
+    hi = starts[has] + counts[has] // 2
+    result[has] = (sorted_values[lo] + sorted_values[hi]) / 2
+    return result
+
+
+def group_slope(groups, x, y, n_groups):
+    """Panta regresiei liniare y ~ x per grup (NaN dacă x nu variază)"""
+    n = np.bincount(groups, minlength=n_groups).astype(np.float64)
+    sx = np.bincount(groups, x, n_groups)
+    sy = np.bincount(groups, y, n_groups)
+    sxx = np.bincount(groups, x * x, n_groups)
+    sxy = np.bincount(groups, x * y, n_groups)
+    denom = n * sxx - sx * sx
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = (n * sxy - sx * sy) / denom
+    slope[np.abs(denom) < 1e-9] = np.nan
+    return slope
+
+
+def window(history, days, now=None):
+    """Rândurile din ultimele `days` zile (toate dacă days e None)"""
+    sku_idx, comp_idx, price, your_price, ts = history.arrays()
+    if days:
+        now = now or time.time()
+        mask = ts >= now - days * DAY
+        return sku_idx[mask], comp_idx[mask], price[mask], your_price[mask], ts[mask]
+    return sku_idx, comp_idx, price, your_price, ts
+
+
+def robust_center(sku_idx, price, n_skus):
+    """Mediană și scară robustă (MAD scalat, cu prag minim) per SKU"""
+    median = group_median(sku_idx, price, n_skus)
+    mad = group_median(sku_idx, np.abs(price - median[sku_idx]), n_skus)
+    scale = np.maximum(MAD_SCALE * mad, MIN_BAND_PCT * median / OUTLIER_Z)
+    return median, mad, scale
+
+
+def outlier_flags(history, days=DEFAULT_DAYS, now=None):
+    """Mască bool per rând din fereastră: |z robust| > OUTLIER_Z"""
+    sku_idx, comp_idx, price, your_price, ts = window(history, days, now)
+    median, _, scale = robust_center(sku_idx, price, len(history.skus))
+    return np.abs(price - median[sku_idx]) > OUTLIER_Z * scale[sku_idx]
+
+
+def sku_stats(history, days=DEFAULT_DAYS, now=None):
+    """Statistici per SKU: mediană, MAD, outlieri, percentila prețului nostru, trend"""
+    n_skus = len(history.skus)
+    sku_idx, comp_idx, price, your_price, ts = window(history, days, now)
+    if not len(price):
+        return {}
+    counts = np.bincount(sku_idx, minlength=n_skus)
+    median, mad, scale = robust_center(sku_idx, price, n_skus)
+    outliers = np.abs(price - median[sku_idx]) > OUTLIER_Z * scale[sku_idx]
+    outlier_counts = np.bincount(sku_idx, outliers, n_skus)
+    clean = ~outliers
+    low = np.full(n_skus, np.inf)
+    np.minimum.at(low, sku_idx[clean], price[clean])
+
+    # Percentila prețului nostru = % din prețurile concurenților sub prețul nostru
+    ours = np.array([history.your_price.get(sku, 0.0) for sku in history.skus])
+    below = np.bincount(sku_idx, (price < ours[sku_idx]) & clean, n_skus)
+    clean_counts = np.bincount(sku_idx, clean, n_skus)
+
+    # Trend: panta prețurilor curate în timp → % schimbare pe toată fereastra
+    days_x = (ts - ts.min()) / DAY
+    slope = group_slope(sku_idx[clean], days_x[clean], price[clean], n_skus)
+    span = days or np.ptp(days_x) or 1
+
+    stats = {}
+    for i in np.flatnonzero(counts):
+        sku = history.skus[i]
+        stats[sku] = {
+            'observations': int(counts[i]),
+            'median': round(float(median[i]), 2),
+            'mad': round(float(mad[i]), 2),
+            'outliers': int(outlier_counts[i]),
+            'min': round(float(low[i]), 2) if np.isfinite(low[i]) else None,
+            'your_price': float(ours[i]) or None,
+            'position_pct': round(float(below[i] / clean_counts[i] * 100), 1) if ours[i] > 0 and clean_counts[i] else None,
+            'trend_pct': round(float(slope[i] * span / median[i] * 100), 1) if np.isfinite(slope[i]) else None,
+        }
+    return stats
+
+
+def competitor_stats(history, days=DEFAULT_DAYS, now=None):
+    """Statistici per concurent: câte oferte, raport median față de prețul nostru, cât de des e mai ieftin"""
+    n_comps = len(history.competitors)
+    sku_idx, comp_idx, price, your_price, ts = window(history, days, now)
+    if not len(price):
+        return {}
+    outliers = outlier_flags(history, days, now)
+    counts = np.bincount(comp_idx, minlength=n_comps)
+    outlier_counts = np.bincount(comp_idx, outliers, n_comps)
+    skus = np.bincount(np.unique(comp_idx * len(history.skus) + sku_idx) // len(history.skus), minlength=n_comps)
+
+    ours = your_price > 0
+    ratio = group_median(comp_idx[ours], price[ours] / your_price[ours], n_comps)
+    ours_counts = np.bincount(comp_idx[ours], minlength=n_comps)
+    cheaper = np.bincount(comp_idx[ours], price[ours] < your_price[ours], n_comps)
+
+    stats = {}
+    for i in np.flatnonzero(counts):
+        stats[history.competitors[i]] = {
+            'observations': int(counts[i]),
+            'skus': int(skus[i]),
+            'outliers': int(outlier_counts[i]),
+            'median_ratio': round(float(ratio[i]), 3) if np.isfinite(ratio[i]) else None,
+            'cheaper_pct': round(float(cheaper[i] / ours_counts[i] * 100), 1) if ours_counts[i] else None,
+        }
+    return stats
+
+
+def price_band(history, sku, days=DEFAULT_DAYS, now=None):
+    """(min, max) acceptat pentru prețurile unui SKU pe baza istoricului; None dacă istoricul e prea scurt"""
+    if sku not in history.sku_prices:
+        return None
+    sku_prices, sku_ts = history.sku_prices[sku]
+    prices = np.array(sku_prices)
+    if days:
+        now = now or time.time()
+        prices = prices[np.array(sku_ts) >= now - days * DAY]
+    if len(prices) < MIN_HISTORY:
+        return None
+    median = float(np.median(prices))
+    scale = max(MAD_SCALE * float(np.median(np.abs(prices - median))), MIN_BAND_PCT * median / OUTLIER_Z)
+    return median - OUTLIER_Z * scale, median + OUTLIER_Z * scale
@@ -0,0 +1,166 @@
+"""PriceMonitor - scanare batch din linia de comandă (cron / pipeline)
+
+Citește catalogul CSV cu aceeași detecție de coloane ca UI-ul și scrie câte o
+linie JSON per SKU imediat ce e gata. Cu -o, o rulare întreruptă se reia de unde
+a rămas (SKU-urile deja prezente în fișier sunt sărite).
+
+    python batch.py catalog.csv -o rezultate.jsonl --concurrency 2
+"""
+import argparse
+import csv
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+from app import scan_product, save_scan, normalize, logger, sku_index, telemetry, planner, BrowserHost, SCAN_BUDGET
+
+
+# ============ DETECȚIE COLOANE (identic cu templates/index.html) ============
+def find_column_index(norm_headers, search_terms, exclude_terms=()):
+    for term in search_terms:
+        for idx, h in enumerate(norm_headers):
+            if term in h and not any(ex in h for ex in exclude_terms):
+                return idx
+    return -1
+
+def parse_price(value):
+    """Ca parsePrice din UI: '1.234,56' → 1234.56, '1234.56' → 1234.56"""
+    c = str(value or '').strip()
+    if not c:
+        return 0
+    if ',' in c and c.index(',') > c.rfind('.'):
+        c = c.replace('.', '').replace(',', '.', 1)
+    elif ',' in c:
+        c = c.replace(',', '.', 1)
+    c = ''.join(ch for ch in c if ch.isdigit() or ch == '.')
+    try:
+        return float(c)
+    except ValueError:
+        return 0
+
+def read_catalog(path):
+    """[{sku, name, price}] din CSV-ul de catalog"""
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        rows = [r for r in csv.reader(f) if len(r) > 1 or (r and r[0].strip())]
+    if len(rows) < 2:
+        raise ValueError("CSV invalid sau gol")
+    norm_headers = [normalize(h) for h in rows[0]]
+
+    i_sku = find_column_index(norm_headers, ['sku', 'cod', 'codprodus'])
+    i_name = find_column_index(norm_headers, ['nume', 'numeprodus', 'titlu', 'name', 'title'])
+    i_price = find_column_index(norm_headers, ['pretobisnuit', 'regularprice'], ['promotional', 'promo', 'concurent'])
+    if i_price == -1:
+        i_price = find_column_index(norm_headers, ['pret', 'price'], ['promotional', 'promo', 'concurent'])
+    if i_sku == -1:
+        raise ValueError("Nu găsesc coloana SKU!")
+
+    products = []
+    for r in rows[1:]:
+        r = [cell.strip() for cell in r]
+        if len(r) <= i_sku or not r[i_sku]:
+            continue
+        products.append({
+            'sku': r[i_sku],
+            'name': r[i_name] if i_name != -1 and len(r) > i_name else '',
+            'price': parse_price(r[i_price]) if i_price != -1 and len(r) > i_price else 0,
+        })
+    return products
+
+def done_skus(path):
+    """SKU-urile deja scrise într-un output anterior (linii incomplete sunt ignorate)"""
+    done = set()
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if 'error' not in record:
+                    done.add(record['sku'])
+    except FileNotFoundError:
+        pass
+    return done
+
+
+def scan_one(product, save_history, budget=SCAN_BUDGET, host=None):
+    record = {'sku': product['sku'], 'name': product['name'], 'your_price': product['price']}
+    try:
+        results = scan_product(product['sku'], product['name'], product['price'], budget=budget, host=host)
+        record['competitors'] = list(results)
+        if results.partial:
+            record['partial'] = True
+        if save_history:
+            save_scan(product['sku'], product['name'], product['price'], results, results.partial, results.snapshot)
+    except Exception as e:
+        record['error'] = str(e)[:200]
+    record['timestamp'] = datetime.now().isoformat()
+    return record
+
+
+def main():
+    parser = argparse.ArgumentParser(description='PriceMonitor batch scan → JSONL')
+    parser.add_argument('catalog', help='CSV catalog (aceleași coloane ca în UI)')
+    parser.add_argument('-o', '--output', help='fișier JSONL (append + reluare); implicit stdout')
+    parser.add_argument('-c', '--concurrency', type=int, default=1, help='câte browsere în paralel')
+    parser.add_argument('--pause', type=float, default=5, help='pauză după fiecare SKU, per browser')
+    parser.add_argument('--limit', type=int, default=0, help='scanează doar primele N SKU-uri rămase')
+    parser.add_argument('--no-history', action='store_true', help='nu salva scanările în istoric')
+    parser.add_argument('--budget', type=float, default=SCAN_BUDGET, help='secunde per SKU (0 = fără limită); rezultatele tăiate sunt marcate partial')
+    args = parser.parse_args()
+
+    products = read_catalog(args.catalog)
+    # SERP-urile fiecărui SKU alimentează și SKU-urile înrudite din același CSV
+    sku_index.build(products)
+    done = done_skus(args.output) if args.output else set()
+    todo = [p for p in products if p['sku'] not in done]
+    if args.limit:
+        todo = todo[:args.limit]
+    logger.info(f"📋 {len(products)} produse, {len(done)} deja scanate, {len(todo)} de scanat")
+
+    out = open(args.output, 'a', encoding='utf-8') if args.output else sys.stdout
+    lock = threading.Lock()
+    # Un Chromium per thread din pool, refolosit între SKU-uri (Playwright sync e legat de thread);
+    # browserele rămase se închid odată cu procesul
+    local = threading.local()
+
+    def job(product):
+        if getattr(local, 'host', None) is None:
+            local.host = BrowserHost(f"batch-{threading.get_ident()}")
+        record = scan_one(product, not args.no_history, args.budget, local.host)
+        with lock:
+            out.write(json.dumps(record, ensure_ascii=False) + '\n')
+            out.flush()
+        time.sleep(args.pause)
+        return record
+
+    telemetry.start()
+    started = time.time()
+    failed = partial = 0
+    pool = ThreadPoolExecutor(max_workers=max(1, args.concurrency))
+    try:
+        for i, future in enumerate(as_completed([pool.submit(job, p) for p in todo]), 1):
+            record = future.result()
+            failed += 'error' in record
+            partial += bool(record.get('partial'))
+            logger.info(f"✅ {i}/{len(todo)} {record['sku']} ({time.time() - started:.0f}s)")
+    except KeyboardInterrupt:
+        # SKU-urile în curs se termină și se scriu; restul rămân pentru reluare
+        logger.info("🛑 Oprit - rulează aceeași comandă ca să continui")
+        pool.shutdown(wait=True, cancel_futures=True)
+        return 130
+    finally:
+        pool.shutdown(wait=True)
+        if out is not sys.stdout:
+            out.close()
+    logger.info(f"🏁 Gata: {len(todo) - failed} ok ({partial} parțiale), {failed} erori")
+    plan = planner.report()
+    logger.info(f"🧭 Planificator (cumulat): {plan['queries']} interogări, {plan['saved']} economisite față de planul fix ({plan['saved_pct']}%)")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
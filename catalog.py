@@ -0,0 +1,187 @@
+"""PriceMonitor - catalogul de produse pe server, cu index de căutare și paginare
+
+UI-ul nu mai ține tot catalogul în memorie: încarcă CSV-ul o dată (POST /api/products)
+și cere câte o pagină filtrată/sortată. Căutarea folosește aceeași normalizare ca
+UI-ul (normalize din app.py), peste SKU și denumire:
+- interogări scurte (< 3 caractere) → prefix pe SKU/denumire, cu bisect pe liste sortate
+- restul → intersecția trigramelor, apoi verificare de subșir pe candidați
+"""
+import json
+import os
+import threading
+from bisect import bisect_left
+from datetime import datetime
+
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+SORTS = ('id', 'sku', 'name', 'price', 'diff', 'last_check')
+STATUSES = ('all', 'checked', 'unchecked', 'undercut')
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class Catalog:
+    """Produsele încărcate + ultimul rezultat de scanare pentru fiecare"""
+
+    def __init__(self, path, normalize):
+        self.path = path
+        self.normalize = normalize
+        self.lock = threading.Lock()
+        self.products = []
+        self.by_sku = {}
+        self.keys = []
+        self.grams = {}
+        self.sku_sorted = []
+        self.name_sorted = []
+        self._stats = None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self._build(json.load(f))
+        except (OSError, ValueError):
+            pass
+
+    def _build(self, items):
+        products, by_sku, keys, grams = [], {}, [], {}
+        for item in items:
+            sku = str(item.get('sku', '')).strip()
+            if not sku:
+                continue
+            i = len(products)
+            products.append({
+                'id': i,
+                'sku': sku,
+                'name': item.get('name') or '',
+                'price': float(item.get('price', 0) or 0),
+                'image': item.get('image'),
+                'comps': [],
+                'lastCheck': None,
+                'partial': False,
+                'diff': None,
+            })
+            by_sku.setdefault(sku, []).append(i)
+            key = (self.normalize(sku), self.normalize(item.get('name') or ''))
+            keys.append(key)
+            for g in trigrams(key[0]) | trigrams(key[1]):
+                grams.setdefault(g, set()).add(i)
+        self.products, self.by_sku, self.keys, self.grams = products, by_sku, keys, grams
+        self._stats = None
+        self.sku_sorted = sorted((k[0], i) for i, k in enumerate(keys))
+        self.name_sorted = sorted((k[1], i) for i, k in enumerate(keys))
+
+    def load(self, items, last_scans=None):
+        """Înlocuiește catalogul (upload CSV); rezultatele din istoric sunt reatașate per SKU"""
+        with self.lock:
+            self._build(items)
+            for scan in (last_scans or {}).values():
+                self._attach(scan)
+            tmp = f"{self.path}.tmp"
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump([{k: p[k] for k in ('sku', 'name', 'price', 'image')} for p in self.products], f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+            return len(self.products)
+
+    def record(self, scan):
+        """Rezultatul unei scanări (înregistrarea din save_scan)"""
+        with self.lock:
+            self._attach(scan)
+
+    def _attach(self, scan):
+        self._stats = None
+        for i in self.by_sku.get(scan.get('sku'), []):
+            p = self.products[i]
+            comps = []
+            for c in scan.get('competitors') or []:
+                c = dict(c)
+                c['diff'] = round((c['price'] - p['price']) / p['price'] * 100, 1) if p['price'] > 0 else 0
+                comps.append(c)
+            p['comps'] = comps
+            p['lastCheck'] = scan.get('timestamp') or datetime.now().isoformat()
+            p['partial'] = bool(scan.get('partial'))
+            p['diff'] = min(c['diff'] for c in comps) if comps and p['price'] > 0 else None
+
+    def get(self, product_id):
+        with self.lock:
+            if 0 <= product_id < len(self.products):
+                return dict(self.products[product_id])
+            return None
+
+    def _prefix(self, sorted_keys, q):
+        start = bisect_left(sorted_keys, (q,))
+        ids = set()
+        for key, i in sorted_keys[start:]:
+            if not key.startswith(q):
+                break
+            ids.add(i)
+        return ids
+
+    def search(self, query):
+        """Id-urile care se potrivesc (None = fără filtru)"""
+        q = self.normalize(query)
+        if not q:
+            return None
+        if len(q) < 3:
+            return self._prefix(self.sku_sorted, q) | self._prefix(self.name_sorted, q)
+        postings = sorted((self.grams.get(g, set()) for g in trigrams(q)), key=len)
+        ids = set(postings[0])
+        for posting in postings[1:]:
+            ids &= posting
+            if not ids:
+                break
+        return {i for i in ids if q in self.keys[i][0] or q in self.keys[i][1]}
+
+    def matches(self, p, status):
+        if status == 'checked':
+            return p['lastCheck'] is not None
+        if status == 'unchecked':
+            return p['lastCheck'] is None
+        if status == 'undercut':
+            return p['price'] > 0 and any(c['price'] < p['price'] for c in p['comps'])
+        return True
+
+    def query(self, q='', status='all', sort='id', order='asc', page=1, per_page=PAGE_SIZE, ids_only=False):
+        """O pagină din catalog + totaluri; per_page=0 = toate rezultatele (export)"""
+        status = status if status in STATUSES else 'all'
+        sort = sort if sort in SORTS else 'id'
+        with self.lock:
+            ids = self.search(q)
+            rows = self.products if ids is None else [self.products[i] for i in sorted(ids)]
+            rows = [p for p in rows if self.matches(p, status)]
+            if sort != 'id' or order == 'desc':
+                # Produsele fără valoare (nescanate) rămân la final în ambele direcții
+                if sort in ('sku', 'name'):
+                    col = 0 if sort == 'sku' else 1
+                    value = lambda p: self.keys[p['id']][col]
+                else:
+                    field = {'last_check': 'lastCheck'}.get(sort, sort)
+                    value = lambda p: p[field]
+                present = [p for p in rows if value(p) is not None]
+                missing = [p for p in rows if value(p) is None]
+                present.sort(key=lambda p: (value(p), p['id']), reverse=order == 'desc')
+                rows = present + missing
+            total = len(rows)
+            if ids_only:
+                return {'total': total, 'ids': [p['id'] for p in rows]}
+            if per_page:
+                per_page = min(max(1, per_page), MAX_PAGE_SIZE)
+                page = max(1, page)
+                rows = rows[(page - 1) * per_page:page * per_page]
+            return {
+                'total': total,
+                'page': page,
+                'per_page': per_page,
+                'products': [dict(p) for p in rows],
+                'stats': self.stats(),
+            }
+
+    def stats(self):
+        """Totalurile din antet - recalculate doar după upload/scanare"""
+        if self._stats is None:
+            self._stats = {
+                'total': len(self.products),
+                'checked': sum(1 for p in self.products if p['lastCheck'] is not None),
+                'withPrice': sum(1 for p in self.products if p['price'] > 0),
+                'undercut': sum(1 for p in self.products if self.matches(p, 'undercut')),
+            }
+        return self._stats
@@ -0,0 +1,103 @@
+"""PriceMonitor - evenimente de schimbare preț (feed append-only + SSE + webhook)
+
+Fiecare scanare e comparată doar cu ultimul snapshot al aceluiași SKU,
+deci costul e proporțional cu numărul de concurenți ai scanării, nu cu catalogul.
+"""
+import json
+import logging
+import os
+import threading
+import urllib.request
+from collections import deque
+from datetime import datetime
+
+logger = logging.getLogger('PriceMonitor')
+
+PRICE_MOVE_PCT = 5.0    # mișcare de preț raportată peste ±5%
+FEED_MEMORY = 1000      # ultimele N evenimente ținute în memorie pentru SSE
+WEBHOOK_TIMEOUT = 5
+
+
+def detect_changes(sku, your_price, competitors, previous, move_pct=PRICE_MOVE_PCT):
+    """Evenimente pentru o scanare față de snapshot-ul anterior {domeniu: preț}
+
+    previous=None înseamnă că SKU-ul n-a mai fost scanat: nu raportăm concurenți „noi”.
+    """
+    events = []
+    for comp in competitors:
+        domain, price = comp['name'], comp['price']
+        old_price = previous.get(domain) if previous else None
+        base = {'sku': sku, 'competitor': domain, 'price': price, 'old_price': old_price, 'your_price': your_price}
+
+        if previous is not None and old_price is None:
+            events.append({**base, 'type': 'new_competitor'})
+
+        # Ne bate la preț acum, dar nu ne bătea înainte
+        if your_price > 0 and price < your_price and (old_price is None or old_price >= your_price):
+            events.append({**base, 'type': 'undercut', 'change_pct': round((price - your_price) / your_price * 100, 1)})
+
+        if old_price:
+            change_pct = (price - old_price) / old_price * 100
+            if abs(change_pct) > move_pct:
+                events.append({**base, 'type': 'price_move', 'change_pct': round(change_pct, 1)})
+    return events
+
+
+class EventFeed:
+    """Feed append-only (events.jsonl) + buffer în memorie pentru abonați SSE + webhook opțional"""
+
+    def __init__(self, path, webhook_url=None):
+        self.path = path
+        self.webhook_url = webhook_url
+        self.recent = deque(maxlen=FEED_MEMORY)
+        self.last_id = 0
+        self.cond = threading.Condition()
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        self.recent.append(json.loads(line))
+                    except ValueError:
+                        continue
+            if self.recent:
+                self.last_id = self.recent[-1]['id']
+
+    def publish(self, events):
+        """Numerotează, scrie în feed, trezește abonații SSE și trimite webhook-ul"""
+        if not events:
+            return []
+        timestamp = datetime.now().isoformat()
+        with self.cond:
+            for event in events:
+                self.last_id += 1
+                event['id'] = self.last_id
+                event['timestamp'] = timestamp
+            with open(self.path, 'a', encoding='utf-8') as f:
+                for event in events:
+                    f.write(json.dumps(event, ensure_ascii=False) + '\n')
+            self.recent.extend(events)
+            self.cond.notify_all()
+        for event in events:
+            logger.info(f"   📣 {event['type']}: {event['competitor']} {event['price']} Lei")
+        if self.webhook_url:
+            threading.Thread(target=self.send_webhook, args=(events,), daemon=True).start()
+        return events
+
+    def since(self, last_id):
+        """Evenimentele cu id > last_id încă ținute în memorie"""
+        with self.cond:
+            return [e for e in self.recent if e['id'] > last_id]
+
+    def wait(self, last_id, timeout):
+        """Blochează până apar evenimente noi după last_id sau expiră timeout-ul"""
+        with self.cond:
+            self.cond.wait_for(lambda: self.last_id > last_id, timeout=timeout)
+        return self.since(last_id)
+
+    def send_webhook(self, events):
+        body = json.dumps({'events': events}, ensure_ascii=False).encode('utf-8')
+        req = urllib.request.Request(self.webhook_url, data=body, headers={'Content-Type': 'application/json'})
+        try:
+            urllib.request.urlopen(req, timeout=WEBHOOK_TIMEOUT).close()
+        except Exception as e:
+            logger.info(f"   ⚠️ Webhook: {str(e)[:40]}")
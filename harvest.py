@@ -0,0 +1,77 @@
+"""PriceMonitor - prețuri oportuniste pentru SKU-uri înrudite
+
+SERP-ul unui SKU listează des și variante din același catalog (ex. BT 0052 1600 LEFT
+vs RIGHT). Cardurile atribuite altui SKU din catalog sunt păstrate aici și folosite
+la scanarea acelui SKU: dacă sunt destule, căutarea lui e sărită, altfel îi umplu
+pragurile și taie din căutările ulterioare (Google #2/#3, Bing).
+"""
+import json
+import os
+import threading
+import time
+
+HARVEST_MAX_AGE = 24 * 3600   # un preț oportunist e bun o zi
+HARVEST_SATISFY = 5           # atâtea domenii proaspete → SKU-ul nu mai e căutat deloc
+
+
+class HarvestStore:
+    """sku → {domeniu: preț găsit pe SERP-ul altui SKU}, persistat în JSONL append-only"""
+
+    def __init__(self, path, max_age=HARVEST_MAX_AGE):
+        self.path = path
+        self.max_age = max_age
+        self.lock = threading.Lock()
+        self.items = {}
+        self.stats = {'harvested': 0, 'used': 0, 'satisfied': 0}
+        self._load()
+
+    def _load(self):
+        """Citește fișierul și îl compactează (doar intrările proaspete, ultima per sku/domeniu)"""
+        if not os.path.exists(self.path):
+            return
+        now = time.time()
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if now - entry.get('at', 0) > self.max_age:
+                    continue
+                if entry.get('taken'):
+                    self.items.pop(entry['sku'], None)
+                else:
+                    self.items.setdefault(entry['sku'], {})[entry['domain']] = entry
+        tmp = f"{self.path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            for entries in self.items.values():
+                for entry in entries.values():
+                    f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        os.replace(tmp, self.path)
+
+    def _append(self, entry):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+    def add(self, sku, domain, price, via, source):
+        """Preț pentru `sku` văzut pe SERP-ul lui `via`"""
+        entry = {'sku': sku, 'domain': domain, 'price': price, 'via': via, 'source': source, 'at': time.time()}
+        with self.lock:
+            self.items.setdefault(sku, {})[domain] = entry
+            self.stats['harvested'] += 1
+            self._append(entry)
+
+    def take(self, sku):
+        """Intrările proaspete pentru sku; sunt consumate (următoarea scanare caută din nou)"""
+        now = time.time()
+        with self.lock:
+            entries = [e for e in self.items.pop(sku, {}).values() if now - e['at'] <= self.max_age]
+            if entries:
+                self.stats['used'] += 1
+                self.stats['satisfied'] += len(entries) >= HARVEST_SATISFY
+                self._append({'sku': sku, 'taken': True, 'at': now})
+            return entries
+
+    def pending(self):
+        with self.lock:
+            return {'skus': len(self.items), 'prices': sum(len(v) for v in self.items.values()), **self.stats}
@@ -0,0 +1,205 @@
+"""PriceMonitor - test de încărcare end-to-end (browser real, motor de căutare stub)
+
+Pornește stub_engine.py în proces, îndreaptă scan_product spre el și rulează același
+set de SKU-uri la mai multe niveluri de concurență. Raportează SKU/minut, latența
+p50/p95 per SKU și memoria (Python + procesele Chromium).
+
+    python loadtest.py --skus 30 --concurrency 1,2,4 --latency 300 --consent 0.3
+    python loadtest.py --catalog catalog.csv --limit 50 --concurrency 2 --json rezultat.json
+"""
+import argparse
+import json
+import os
+import sys
+import queue
+import tempfile
+import threading
+import time
+
+from werkzeug.serving import make_server
+
+from stub_engine import StubEngine, create_app, load_captures
+from telemetry import process_tree_rss
+
+SAMPLE_INTERVAL = 0.5
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    k = (len(values) - 1) * pct / 100
+    lo = int(k)
+    hi = min(lo + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (k - lo)
+
+
+def start_stub(engine, port):
+    server = make_server('127.0.0.1', port, create_app(engine), threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def synthetic_products(captures, n):
+    """SKU-urile capturate, apoi SKU-uri sintetice (variante deterministe în stub)"""
+    products = [{'sku': sku, 'name': f"Produs test {sku} alb", 'price': 0} for sku in sorted(captures)]
+    i = 0
+    while len(products) < n:
+        i += 1
+        sku = f"SYN{i:05d}"
+        products.append({'sku': sku, 'name': f"Produs test {sku} alb", 'price': 0})
+    return products[:n]
+
+
+def run_level(app, products, concurrency, budget):
+    """Rulează toate produsele la un nivel de concurență; latențe per SKU + memorie eșantionată.
+
+    Fiecare worker își ține browserul (BrowserHost) pe tot nivelul, ca worker.py în producție.
+    """
+    latencies = []
+    errors = partial = competitors = restarts = 0
+    lock = threading.Lock()
+    peak = [process_tree_rss()]
+    stop = threading.Event()
+
+    def sampler():
+        while not stop.wait(SAMPLE_INTERVAL):
+            peak[0] = max(peak[0], process_tree_rss())
+
+    def job(product, host):
+        nonlocal errors, partial, competitors
+        started = time.time()
+        try:
+            results = app.scan_product(product['sku'], product['name'], product['price'], budget=budget, host=host)
+            ok = True
+        except Exception as e:
+            app.logger.info(f"   ❌ {product['sku']}: {str(e)[:60]}")
+            ok = False
+        elapsed = time.time() - started
+        with lock:
+            latencies.append(elapsed)
+            if not ok:
+                errors += 1
+            else:
+                partial += results.partial
+                competitors += len(results)
+
+    todo = queue.Queue()
+    for product in products:
+        todo.put(product)
+
+    def worker(i):
+        nonlocal restarts
+        host = app.BrowserHost(f"load-{concurrency}-{i}")
+        try:
+            while True:
+                try:
+                    product = todo.get_nowait()
+                except queue.Empty:
+                    break
+                job(product, host)
+        finally:
+            with lock:
+                restarts += host.restarts
+            host.shutdown()
+
+    threading.Thread(target=sampler, daemon=True).start()
+    started = time.time()
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.time() - started
+    stop.set()
+    return {
+        'concurrency': concurrency,
+        'skus': len(products),
+        'errors': errors,
+        'partial': partial,
+        'competitors_per_sku': round(competitors / max(1, len(products) - errors), 2),
+        'wall_s': round(wall, 1),
+        'skus_per_min': round(len(products) / wall * 60, 2),
+        'p50_s': round(percentile(latencies, 50), 2),
+        'p95_s': round(percentile(latencies, 95), 2),
+        'peak_rss_mb': round(peak[0], 1),
+        'end_rss_mb': round(process_tree_rss(), 1),
+        'restarts': restarts,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='PriceMonitor end-to-end load test pe motorul stub')
+    parser.add_argument('--skus', type=int, default=20, help='câte SKU-uri (capturate + sintetice)')
+    parser.add_argument('--catalog', help='CSV de catalog în loc de SKU-uri sintetice')
+    parser.add_argument('--limit', type=int, default=0, help='primele N produse din catalog')
+    parser.add_argument('--concurrency', default='1,2,4', help='niveluri de concurență, separate prin virgulă')
+    parser.add_argument('--port', type=int, default=9000)
+    parser.add_argument('--latency', type=float, default=300, help='latența stub-ului (ms)')
+    parser.add_argument('--jitter', type=float, default=100)
+    parser.add_argument('--consent', type=float, default=0.0, help='fracțiunea de pagini cu dialog de consimțământ')
+    parser.add_argument('--block', type=float, default=0.0, help='fracțiunea de cereri blocate (/sorry/)')
+    parser.add_argument('--rate', type=float, default=6000, help='interogări/minut per proxy (implicit practic nelimitat)')
+    parser.add_argument('--ban-seconds', type=float, default=5, help='durata ban-ului după o pagină /sorry/ (producție: 600)')
+    parser.add_argument('--budget', type=float, default=0, help='buget per SKU în secunde (0 = fără limită)')
+    parser.add_argument('--json', help='scrie rezultatele și în acest fișier')
+    args = parser.parse_args()
+
+    captures = load_captures()
+    if not captures:
+        print("Nu există capturi google_*_html.html în debug/")
+        return 1
+    engine = StubEngine(captures, args.latency, args.jitter, args.consent, args.block, seed=1)
+    server = start_stub(engine, args.port)
+
+    # URL-urile motoarelor sunt citite la importul app.py
+    os.environ['PRICEMONITOR_GOOGLE_URL'] = f"http://127.0.0.1:{args.port}"
+    os.environ['PRICEMONITOR_BING_URL'] = f"http://127.0.0.1:{args.port}/bing"
+    import app
+    import proxy_pool
+    from proxy_pool import ProxyPool
+    from harvest import HarvestStore
+    from planner import QueryPlanner
+    from sessions import SessionStore
+
+    # Stare izolată: fără rate limit de producție, fără prețuri oportuniste sau sesiuni reale
+    workdir = tempfile.mkdtemp(prefix='pricemonitor-load-')
+    proxy_pool.BAN_SECONDS = proxy_pool.MAX_BAN_SECONDS = args.ban_seconds
+    app.proxy_pool = ProxyPool(rate_per_min=args.rate, burst=max(3, int(args.rate / 60)))
+    app.harvest_store = HarvestStore(os.path.join(workdir, 'harvest.jsonl'))
+    app.sku_index.build([])
+    app.planner = QueryPlanner(os.path.join(workdir, 'planner.jsonl'), app.normalize, seed=1)
+    app.session_store = SessionStore(os.path.join(workdir, 'sessions'))
+
+    if args.catalog:
+        from batch import read_catalog
+        products = read_catalog(args.catalog)
+        if args.limit:
+            products = products[:args.limit]
+    else:
+        products = synthetic_products(captures, args.skus)
+
+    levels = [int(c) for c in args.concurrency.split(',') if c.strip()]
+    report = []
+    try:
+        for concurrency in levels:
+            app.logger.info(f"🧪 {len(products)} SKU-uri × concurență {concurrency}")
+            report.append(run_level(app, products, concurrency, args.budget))
+    finally:
+        server.shutdown()
+
+    print(f"\n{'conc':>4} {'skus':>5} {'err':>4} {'part':>4} {'comp/sku':>8} {'SKU/min':>8} {'p50 s':>7} {'p95 s':>7} {'peak MB':>8} {'end MB':>7} {'restart':>7}")
+    for r in report:
+        print(f"{r['concurrency']:>4} {r['skus']:>5} {r['errors']:>4} {r['partial']:>4} {r['competitors_per_sku']:>8} "
+              f"{r['skus_per_min']:>8} {r['p50_s']:>7} {r['p95_s']:>7} {r['peak_rss_mb']:>8} {r['end_rss_mb']:>7} {r['restarts']:>7}")
+    plan = app.planner.report()
+    print(f"stub: {engine.stats}")
+    print(f"planner: {plan['queries']} interogări, {plan['saved']} economisite față de planul fix ({plan['saved_pct']}%)")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'args': vars(args), 'stub': engine.stats, 'levels': report, 'planner': plan}, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,166 @@
+"""PriceMonitor - planificator adaptiv al căutărilor per SKU
+
+Google #1 (SKU simplu) rulează mereu. Celelalte variante - Google #2 (SKU + "pret RON"),
+Google #3 (denumire) și Bing - sunt ordonate după câți concurenți acceptați (rămași în
+rezultatul final) au adus în plus față de variantele rulate înaintea lor, și sărite dacă
+istoric nu aduc nimic. Decide statistica SKU-ului, iar până are destule observații,
+cea a familiei (prefixul SKU-ului normalizat). Pragurile fixe (< 5 domenii pentru Google,
+< 3 pentru Bing) rămân condiția de oprire; fără istoric planul e exact cel fix.
+
+Interogările planului fix sunt estimate per scanare din domeniile aduse de fiecare
+variantă rulată (o variantă nerulată contează ca neaducând nimic); scanările tăiate de
+buget sunt socotite ca planul fix.
+"""
+import json
+import os
+import random
+import threading
+import time
+
+PLANNER_MAX_AGE = 90 * 24 * 3600
+PLANNER_MIN_SKU_TRIES = 2       # observații pe SKU înainte să decidă statistica lui
+PLANNER_MIN_FAMILY_TRIES = 5    # ... altfel a familiei
+PLANNER_SKIP_BELOW = 0.1        # variantă utilă în < 10% din încercări → sărită
+PLANNER_EXPLORE = 0.1           # ... dar rulată totuși din când în când, ca statistica să nu înghețe
+FAMILY_PREFIX = 3
+
+BASE_VARIANT = 'google_simple'
+# Varianta → pragul fix: rulează doar cât timp sunt mai puțin de atâtea domenii
+VARIANTS = {'google_price': 5, 'google_name': 5, 'bing': 3}
+VARIANT_LABELS = {'google_simple': 'Google #1', 'google_price': 'Google #2', 'google_name': 'Google #3', 'bing': 'Bing'}
+
+
+class QueryPlanner:
+    """Randamentul fiecărei variante per SKU și per familie, persistat în JSONL append-only"""
+
+    def __init__(self, path, normalize, max_age=PLANNER_MAX_AGE, explore=PLANNER_EXPLORE, seed=None):
+        self.path = path
+        self.normalize = normalize
+        self.max_age = max_age
+        self.explore = explore
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.skus = {}
+        self.families = {}
+        self.variants = {}
+        self.totals = {'scans': 0, 'queries': 0, 'fixed_queries': 0, 'skipped': 0, 'explored': 0}
+        self._load()
+
+    def family(self, sku):
+        return self.normalize(sku)[:FAMILY_PREFIX]
+
+    def _load(self):
+        """Citește observațiile și compactează fișierul (doar cele mai noi de max_age)"""
+        if not os.path.exists(self.path):
+            return
+        now = time.time()
+        kept = []
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if now - entry.get('at', 0) > self.max_age:
+                    continue
+                self._apply(entry)
+                kept.append(entry)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            for entry in kept:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        os.replace(tmp, self.path)
+
+    def _apply(self, entry):
+        scopes = (
+            self.skus.setdefault(entry['sku'], {}),
+            self.families.setdefault(entry['family'], {}),
+            self.variants,
+        )
+        for variant, new in entry['new'].items():
+            for scope in scopes:
+                s = scope.setdefault(variant, {'tries': 0, 'useful': 0, 'new': 0})
+                s['tries'] += 1
+                s['useful'] += new > 0
+                s['new'] += new
+        self.totals['scans'] += 1
+        self.totals['queries'] += len(entry['new'])
+        self.totals['fixed_queries'] += entry.get('fixed', len(entry['new']))
+        self.totals['skipped'] += len(entry.get('skipped', []))
+        self.totals['explored'] += len(entry.get('explored', []))
+
+    def stats(self, sku, variant):
+        """(statistica, 'sku'/'familie') pe care se decide, sau (None, None) fără destule observații"""
+        s = self.skus.get(sku, {}).get(variant)
+        if s and s['tries'] >= PLANNER_MIN_SKU_TRIES:
+            return s, 'sku'
+        s = self.families.get(self.family(sku), {}).get(variant)
+        if s and s['tries'] >= PLANNER_MIN_FAMILY_TRIES:
+            return s, 'familie'
+        return None, None
+
+    def plan(self, sku):
+        """[(variantă, prag, motiv de sărire sau None, explorare)] în ordinea de încercat"""
+        with self.lock:
+            steps = []
+            for i, (variant, need) in enumerate(VARIANTS.items()):
+                s, scope = self.stats(sku, variant)
+                skip = explore = None
+                if s and s['useful'] < s['tries'] * PLANNER_SKIP_BELOW:
+                    if self.random.random() < self.explore:
+                        explore = True
+                    else:
+                        skip = f"{s['useful']}/{s['tries']} utile ({scope})"
+                # Fără statistică = optimist (întâi); la egalitate rămâne ordinea fixă
+                score = s['new'] / s['tries'] if s else float('inf')
+                steps.append((-score, i, variant, need, skip, bool(explore)))
+            steps.sort()
+            return [(variant, need, skip, explore) for _, _, variant, need, skip, explore in steps]
+
+    def fixed_plan(self, base, ran, has_name):
+        """Câte interogări ar fi rulat planul fix (Google #1 + variantele sub prag, în ordinea fixă)"""
+        domains = set(base)
+        queries = 1
+        for variant, need in VARIANTS.items():
+            if len(domains) >= need or (variant == 'google_name' and not has_name):
+                continue
+            queries += 1
+            domains |= ran.get(variant, set())
+        return queries
+
+    def record(self, sku, base, ran, accepted, has_name, partial=False, skipped=(), explored=()):
+        """Rezultatul unei scanări: base = domeniile după Google #1, ran = {variantă: domeniile noi aduse},
+        accepted = toate domeniile acceptate (snapshot-ul scanării, nu doar top 5)"""
+        entry = {
+            'sku': sku,
+            'family': self.family(sku),
+            'new': {variant: len(domains & accepted) for variant, domains in ran.items()},
+            'fixed': len(ran) if partial else self.fixed_plan(base, ran, has_name),
+            'skipped': list(skipped),
+            'explored': list(explored),
+            'at': time.time(),
+        }
+        with self.lock:
+            self._apply(entry)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+    def report(self, top=10):
+        """Interogări rulate vs cele pe care le-ar fi rulat planul fix, randament per variantă/familie"""
+        def rates(stats):
+            return {
+                VARIANT_LABELS.get(v, v): {**s, 'useful_rate': round(s['useful'] / s['tries'], 3) if s['tries'] else 0}
+                for v, s in stats.items()
+            }
+
+        with self.lock:
+            totals = dict(self.totals)
+            fixed = totals['fixed_queries']
+            totals['saved'] = fixed - totals['queries']
+            families = sorted(self.families.items(), key=lambda kv: -kv[1].get(BASE_VARIANT, {}).get('tries', 0))
+            return {
+                **totals,
+                'saved_pct': round(totals['saved'] / fixed * 100, 1) if fixed else 0,
+                'variants': rates(self.variants),
+                'families': {family: rates(stats) for family, stats in families[:top]},
+            }
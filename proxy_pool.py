@@ -0,0 +1,202 @@
+"""PriceMonitor - pool de proxy-uri de ieșire cu rate limit, ban-uri și health check
+
+Fiecare proxy are propriul token bucket (interogări/minut), așa că throughput-ul
+total crește cu numărul de IP-uri. Un worker rămâne lipit de același proxy cât
+timp acesta e sănătos; la ban (pagina /sorry/ a Google) primește altul.
+Fără proxy-uri configurate, pool-ul are o singură intrare „direct” (IP-ul propriu).
+"""
+import logging
+import os
+import threading
+import time
+import urllib.request
+from urllib.parse import urlsplit
+
+logger = logging.getLogger('PriceMonitor')
+
+PROXY_RATE_PER_MIN = 12     # ≈ o interogare la 5s per IP, ca pauza din UI
+PROXY_BURST = 3
+BAN_SECONDS = 600           # primul ban; se dublează la fiecare ban consecutiv
+MAX_BAN_SECONDS = 3600
+HEALTH_URL = 'https://www.google.com/generate_204'
+HEALTH_INTERVAL = 300
+HEALTH_TIMEOUT = 10
+
+
+class Proxy:
+    """Un endpoint de ieșire + contabilitatea lui"""
+
+    def __init__(self, url, rate_per_min=PROXY_RATE_PER_MIN, burst=PROXY_BURST):
+        self.url = url  # None = direct
+        self.rate = rate_per_min / 60.0
+        self.burst = burst
+        self.tokens = float(burst)
+        self.refilled = time.time()
+        self.requests = 0
+        self.failures = 0
+        self.bans = 0
+        self.banned_until = 0.0
+        self.healthy = True
+        self.checked = 0.0
+        self.in_use = 0
+
+    @property
+    def label(self):
+        if not self.url:
+            return 'direct'
+        parts = urlsplit(self.url)
+        return f"{parts.hostname}:{parts.port}" if parts.port else parts.hostname
+
+    def usable(self, now):
+        return self.healthy and self.banned_until <= now
+
+    def refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.refilled) * self.rate)
+        self.refilled = now
+
+    def playwright(self):
+        """Argumentul proxy= pentru browser.new_context (None pentru direct)"""
+        if not self.url:
+            return None
+        parts = urlsplit(self.url)
+        proxy = {'server': f"{parts.scheme}://{parts.hostname}:{parts.port}"}
+        if parts.username:
+            proxy['username'] = parts.username
+            proxy['password'] = parts.password or ''
+        return proxy
+
+    def stats(self, now):
+        return {
+            'proxy': self.label,
+            'requests': self.requests,
+            'failures': self.failures,
+            'bans': self.bans,
+            'banned_for': max(0, round(self.banned_until - now)),
+            'healthy': self.healthy,
+            'in_use': self.in_use,
+            'tokens': round(self.tokens, 2),
+        }
+
+
+class ProxyPool:
+    """Alocare sticky per worker + throttle per proxy + ban/health tracking"""
+
+    def __init__(self, urls=None, rate_per_min=PROXY_RATE_PER_MIN, burst=PROXY_BURST,
+                 health_url=HEALTH_URL, health_interval=HEALTH_INTERVAL):
+        self.proxies = [Proxy(url, rate_per_min, burst) for url in (urls or [None])]
+        self.health_url = health_url
+        self.health_interval = health_interval
+        self.sticky = {}
+        self.lock = threading.Lock()
+        self._health_thread = None
+
+    def acquire(self, worker, until=None):
+        """Proxy-ul workerului (același cât timp e utilizabil, altfel cel mai puțin încărcat).
+
+        Cu until (timestamp), întoarce None dacă niciun proxy nu devine utilizabil la timp.
+        """
+        while True:
+            now = time.time()
+            with self.lock:
+                proxy = self.sticky.get(worker)
+                if proxy is None or not proxy.usable(now):
+                    usable = [p for p in self.proxies if p.usable(now)]
+                    proxy = min(usable, key=lambda p: (p.in_use, p.requests)) if usable else None
+                    if proxy:
+                        self.sticky[worker] = proxy
+                if proxy:
+                    proxy.in_use += 1
+                    return proxy
+                wait = min((p.banned_until for p in self.proxies if p.banned_until > now), default=now + 30) - now
+            if until is not None and now + wait > until:
+                logger.info(f"   ⏳ Toate proxy-urile indisponibile încă {wait:.0f}s - peste buget")
+                return None
+            logger.info(f"   ⏳ Toate proxy-urile indisponibile, aștept {wait:.0f}s")
+            time.sleep(max(1, min(wait, 60)))
+
+    def release(self, proxy):
+        with self.lock:
+            proxy.in_use = max(0, proxy.in_use - 1)
+
+    def throttle(self, proxy, until=None):
+        """Consumă un token din proxy; blochează până e disponibil (apelat înainte de fiecare interogare).
+
+        Cu until (timestamp), întoarce False fără să consume dacă tokenul n-ar fi gata la timp.
+        """
+        while True:
+            with self.lock:
+                now = time.time()
+                proxy.refill(now)
+                if proxy.tokens >= 1:
+                    proxy.tokens -= 1
+                    proxy.requests += 1
+                    return True
+                wait = (1 - proxy.tokens) / proxy.rate
+            if until is not None and now + wait > until:
+                return False
+            time.sleep(wait)
+
+    def report_failure(self, proxy):
+        with self.lock:
+            proxy.failures += 1
+
+    def ban(self, proxy, reason=''):
+        """Proxy blocat de motorul de căutare - scos din rotație cu backoff exponențial"""
+        with self.lock:
+            proxy.bans += 1
+            duration = min(BAN_SECONDS * 2 ** (proxy.bans - 1), MAX_BAN_SECONDS)
+            proxy.banned_until = time.time() + duration
+            for worker in [w for w, p in self.sticky.items() if p is proxy]:
+                del self.sticky[worker]
+        logger.info(f"   🚫 Proxy {proxy.label} ban {duration}s {reason}")
+
+    def check(self, proxy):
+        """Health check: o cerere HTTP prin proxy către health_url"""
+        handlers = [urllib.request.ProxyHandler({'http': proxy.url, 'https': proxy.url} if proxy.url else {})]
+        opener = urllib.request.build_opener(*handlers)
+        try:
+            opener.open(self.health_url, timeout=HEALTH_TIMEOUT).close()
+            healthy = True
+        except Exception:
+            healthy = False
+        with self.lock:
+            if proxy.healthy != healthy:
+                logger.info(f"   {'✅' if healthy else '⚠️'} Proxy {proxy.label} {'OK' if healthy else 'indisponibil'}")
+            proxy.healthy = healthy
+            proxy.checked = time.time()
+        return healthy
+
+    def check_all(self):
+        return {p.label: self.check(p) for p in self.proxies}
+
+    def start_health_checks(self):
+        """Verificare periodică în fundal (doar dacă avem proxy-uri reale)"""
+        if self._health_thread or all(p.url is None for p in self.proxies):
+            return
+
+        def loop():
+            while True:
+                self.check_all()
+                time.sleep(self.health_interval)
+
+        self._health_thread = threading.Thread(target=loop, daemon=True)
+        self._health_thread.start()
+
+    def stats(self):
+        now = time.time()
+        with self.lock:
+            return {
+                'proxies': [p.stats(now) for p in self.proxies],
+                'sticky': {w: p.label for w, p in self.sticky.items()},
+            }
+
+
+def load_proxy_urls(path):
+    """Proxy-uri din PRICEMONITOR_PROXIES (separate prin virgulă) sau din fișier (unul pe linie)"""
+    env = os.environ.get('PRICEMONITOR_PROXIES', '')
+    if env.strip():
+        return [u.strip() for u in env.split(',') if u.strip()]
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    return []
@@ -0,0 +1,156 @@
+"""PriceMonitor - coadă de scanare partajată (SQLite) cu lease-uri și reîncercări
+
+Coordonatorul (app.py) ține coada; workerii (worker.py) cer task-uri prin HTTP,
+primesc un lease pe durată limitată și trimit rezultatul înapoi. Un lease expirat
+(worker căzut) face task-ul din nou disponibil, până la MAX_ATTEMPTS încercări.
+"""
+import json
+import sqlite3
+import time
+from contextlib import contextmanager
+
+LEASE_SECONDS = 300
+MAX_ATTEMPTS = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    sku TEXT NOT NULL,
+    name TEXT,
+    price REAL DEFAULT 0,
+    status TEXT DEFAULT 'pending',
+    attempts INTEGER DEFAULT 0,
+    worker TEXT,
+    lease_until REAL,
+    created REAL,
+    finished REAL,
+    error TEXT,
+    result TEXT
+);
+CREATE INDEX IF NOT EXISTS tasks_status ON tasks(status, lease_until);
+CREATE TABLE IF NOT EXISTS task_log (
+    task_id INTEGER,
+    worker TEXT,
+    event TEXT,
+    at REAL
+);
+"""
+
+
+class ScanQueue:
+    """Coada de SKU-uri; toate operațiile sunt tranzacții SQLite scurte"""
+
+    def __init__(self, path, lease_seconds=LEASE_SECONDS, max_attempts=MAX_ATTEMPTS):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        with self.connect() as db:
+            db.executescript(SCHEMA)
+
+    @contextmanager
+    def connect(self):
+        """Conexiune scurtă, autocommit; tranzacțiile sunt deschise explicit cu BEGIN IMMEDIATE"""
+        db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        db.row_factory = sqlite3.Row
+        db.execute('PRAGMA journal_mode=WAL')
+        try:
+            yield db
+        finally:
+            db.close()
+
+    def log(self, db, task_id, worker, event):
+        db.execute('INSERT INTO task_log VALUES (?, ?, ?, ?)', (task_id, worker, event, time.time()))
+
+    def enqueue(self, products):
+        """products = [{'sku', 'name', 'price'}]; întoarce id-urile create"""
+        now = time.time()
+        ids = []
+        with self.connect() as db:
+            db.execute('BEGIN IMMEDIATE')
+            for p in products:
+                sku = str(p.get('sku', '')).strip()
+                if not sku:
+                    continue
+                cur = db.execute('INSERT INTO tasks (sku, name, price, created) VALUES (?, ?, ?, ?)',
+                                 (sku, p.get('name', ''), float(p.get('price', 0) or 0), now))
+                ids.append(cur.lastrowid)
+            db.execute('COMMIT')
+        return ids
+
+    def lease(self, worker, n=1):
+        """Rezervă până la n task-uri (noi sau cu lease expirat) pentru worker"""
+        now = time.time()
+        with self.connect() as db:
+            db.execute('BEGIN IMMEDIATE')
+            # Lease-uri expirate care au epuizat încercările → failed
+            for row in db.execute("SELECT id, worker FROM tasks WHERE status = 'leased' AND lease_until < ? AND attempts >= ?",
+                                  (now, self.max_attempts)).fetchall():
+                db.execute("UPDATE tasks SET status = 'failed', error = 'lease expired', finished = ? WHERE id = ?", (now, row['id']))
+                self.log(db, row['id'], row['worker'], 'failed')
+            rows = db.execute("""SELECT * FROM tasks
+                                 WHERE status = 'pending' OR (status = 'leased' AND lease_until < ?)
+                                 ORDER BY id LIMIT ?""", (now, n)).fetchall()
+            tasks = []
+            for row in rows:
+                db.execute("UPDATE tasks SET status = 'leased', worker = ?, lease_until = ?, attempts = attempts + 1 WHERE id = ?",
+                           (worker, now + self.lease_seconds, row['id']))
+                if row['status'] == 'leased':
+                    self.log(db, row['id'], row['worker'], 'expired')
+                self.log(db, row['id'], worker, 'leased')
+                tasks.append({'id': row['id'], 'sku': row['sku'], 'name': row['name'], 'price': row['price'],
+                              'attempt': row['attempts'] + 1, 'lease_until': now + self.lease_seconds})
+            db.execute('COMMIT')
+        return tasks
+
+    def extend(self, task_id, worker):
+        """Prelungește lease-ul unui task încă deținut de worker"""
+        with self.connect() as db:
+            cur = db.execute("UPDATE tasks SET lease_until = ? WHERE id = ? AND worker = ? AND status = 'leased'",
+                             (time.time() + self.lease_seconds, task_id, worker))
+            return cur.rowcount == 1
+
+    def complete(self, task_id, worker, competitors=None, error=None):
+        """Rezultatul unui worker; la eroare task-ul revine în coadă până la MAX_ATTEMPTS.
+
+        Întoarce task-ul dacă rezultatul a fost acceptat, None dacă lease-ul nu mai e al workerului.
+        """
+        now = time.time()
+        with self.connect() as db:
+            db.execute('BEGIN IMMEDIATE')
+            row = db.execute("SELECT * FROM tasks WHERE id = ? AND worker = ? AND status = 'leased'", (task_id, worker)).fetchone()
+            if row is None:
+                db.execute('COMMIT')
+                return None
+            if error is None:
+                db.execute("UPDATE tasks SET status = 'done', finished = ?, error = NULL, result = ? WHERE id = ?",
+                           (now, json.dumps(competitors or [], ensure_ascii=False), task_id))
+                self.log(db, task_id, worker, 'done')
+            elif row['attempts'] >= self.max_attempts:
+                db.execute("UPDATE tasks SET status = 'failed', finished = ?, error = ? WHERE id = ?", (now, str(error)[:200], task_id))
+                self.log(db, task_id, worker, 'failed')
+            else:
+                db.execute("UPDATE tasks SET status = 'pending', lease_until = NULL, error = ? WHERE id = ?", (str(error)[:200], task_id))
+                self.log(db, task_id, worker, 'retry')
+            db.execute('COMMIT')
+        return dict(row)
+
+    def stats(self):
+        """Numărul de task-uri pe status + ce a făcut fiecare worker"""
+        with self.connect() as db:
+            status = {r['status']: r['n'] for r in db.execute('SELECT status, COUNT(*) AS n FROM tasks GROUP BY status')}
+            workers = {}
+            for r in db.execute('SELECT worker, event, COUNT(*) AS n, MAX(at) AS last FROM task_log GROUP BY worker, event'):
+                w = workers.setdefault(r['worker'], {'last_seen': 0})
+                w[r['event']] = r['n']
+                w['last_seen'] = max(w['last_seen'], r['last'])
+        return {'tasks': status, 'workers': workers}
+
+    def task(self, task_id):
+        with self.connect() as db:
+            row = db.execute('SELECT * FROM tasks WHERE id = ?', (task_id,)).fetchone()
+            if row is None:
+                return None
+            task = dict(row)
+            task['result'] = json.loads(task['result']) if task['result'] else None
+            task['history'] = [dict(r) for r in db.execute('SELECT worker, event, at FROM task_log WHERE task_id = ? ORDER BY at', (task_id,))]
+        return task
@@ -0,0 +1,92 @@
+"""PriceMonitor - sesiuni de browser persistente (Playwright storage_state)
+
+Cookie-urile de consimțământ (Google, Bing, site-uri) sunt salvate per motor/domeniu
+și per IP de ieșire, apoi încărcate în contextele noi. Pe o sesiune caldă dialogul
+de cookies nu mai apare, deci nu mai plătim timeout-urile de click.
+O sesiune expiră după SESSION_MAX_AGE sau când nu mai are cookie-uri valide.
+"""
+import json
+import os
+import re
+import threading
+import time
+
+SESSION_MAX_AGE = 7 * 86400
+
+# Cheie → fragment de domeniu pentru cookie-uri/origins; orice altă cheie e tratată ca domeniu de site
+ENGINE_DOMAINS = {
+    'google': 'google.',
+    'bing': 'bing.com',
+}
+
+
+def belongs(key, domain):
+    domain = domain.lstrip('.').lower()
+    match = ENGINE_DOMAINS.get(key)
+    if match:
+        return match in domain
+    return domain == key or domain.endswith('.' + key)
+
+
+class SessionStore:
+    """storage_state pe disc, câte un fișier per (cheie, proxy)"""
+
+    def __init__(self, directory, max_age=SESSION_MAX_AGE):
+        self.directory = directory
+        self.max_age = max_age
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, key, proxy_label):
+        safe = re.sub(r'[^a-zA-Z0-9.-]', '_', f"{key}__{proxy_label}")
+        return os.path.join(self.directory, f"{safe}.json")
+
+    def read(self, key, proxy_label):
+        """Starea salvată pentru cheie, fără cookie-urile expirate; None dacă e rece/expirată"""
+        path = self.path(key, proxy_label)
+        try:
+            if time.time() - os.path.getmtime(path) > self.max_age:
+                return None
+            with open(path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        now = time.time()
+        state['cookies'] = [c for c in state.get('cookies', []) if c.get('expires', -1) == -1 or c['expires'] > now]
+        if not state['cookies'] and not state.get('origins'):
+            return None
+        return state
+
+    def load(self, keys, proxy_label):
+        """(storage_state combinat pentru new_context, setul de chei calde)"""
+        combined = {'cookies': [], 'origins': []}
+        warm = set()
+        for key in keys:
+            state = self.read(key, proxy_label)
+            if state:
+                combined['cookies'].extend(state['cookies'])
+                combined['origins'].extend(state.get('origins', []))
+                warm.add(key)
+        return (combined if warm else None), warm
+
+    def save(self, state, keys, proxy_label):
+        """Împarte storage_state-ul contextului pe chei și îl scrie atomic"""
+        for key in keys:
+            part = {
+                'cookies': [c for c in state.get('cookies', []) if belongs(key, c.get('domain', ''))],
+                'origins': [o for o in state.get('origins', []) if belongs(key, re.sub(r'^https?://', '', o.get('origin', '')).split(':')[0])],
+            }
+            if not part['cookies'] and not part['origins']:
+                continue
+            path = self.path(key, proxy_label)
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            with self.lock:
+                with open(tmp, 'w', encoding='utf-8') as f:
+                    json.dump(part, f)
+                os.replace(tmp, path)
+
+    def invalidate(self, key, proxy_label):
+        try:
+            os.remove(self.path(key, proxy_label))
+        except OSError:
+            pass
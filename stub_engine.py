@@ -0,0 +1,213 @@
+"""PriceMonitor - motor de căutare local (stub) pentru teste de încărcare end-to-end
+
+Servește pagini „Google” (/search) și „Bing” (/bing/search, blocuri .b_algo) construite
+din capturile din debug/ (google_*_html.html). Un SKU necunoscut primește o variantă
+sintetică: o captură aleasă determinist, cu SKU-ul înlocuit și prețurile scalate.
+Latența, dialogul de consimțământ și paginile de blocare (/sorry/) sunt configurabile.
+Capturi noi se salvează scanând cu PRICEMONITOR_SAVE_HTML=1 (altfel app.py nu mai scrie HTML-ul).
+
+    python stub_engine.py --port 9000 --latency 300 --consent 0.3 --block 0.02
+    PRICEMONITOR_GOOGLE_URL=http://127.0.0.1:9000 PRICEMONITOR_BING_URL=http://127.0.0.1:9000/bing python batch.py ...
+"""
+import argparse
+import glob
+import html
+import os
+import random
+import re
+import time
+import zlib
+
+import lxml.html
+from flask import Flask, request, redirect, make_response
+
+DEBUG_CAPTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'debug')
+SCRIPT_RE = re.compile(r'<script\b.*?</script>', re.IGNORECASE | re.DOTALL)
+PRICE_RE = re.compile(r'(\d{1,3}(?:\.\d{3})+|\d+),(\d{2})(\s*(?:RON|Lei))')
+BODY_RE = re.compile(r'<body[^>]*>', re.IGNORECASE)
+SYNTHETIC_SKU_RE = re.compile(r'\bSYN\d+\b', re.IGNORECASE)
+# Token de tip cod produs: cifre, opțional litere și separatori (K2748, 26.345.000, 33-265-SL)
+SKU_TOKEN_RE = re.compile(r'^(?=.*\d)[A-Za-z0-9][A-Za-z0-9.\-/]{2,}$')
+BING_MAX_BLOCKS = 15
+
+GOOGLE_CONSENT_HTML = """<div id="consent" style="position:fixed;inset:0;background:#fff;z-index:9">
+<p>Înainte să continuați la Google</p>
+<button onclick="document.cookie='CONSENT=YES+;path=/';document.getElementById('consent').remove()">Accept all</button>
+</div>"""
+BING_CONSENT_HTML = """<div id="bnp_container"><p>Cookie-uri</p>
+<button id="bnp_btn_accept" onclick="document.cookie='BCONSENT=1;path=/';document.getElementById('bnp_container').remove()">Accept</button>
+</div>"""
+SORRY_HTML = "<html><body><p>Our systems have detected unusual traffic from your computer network.</p></body></html>"
+
+
+def capture_sku(path):
+    """'debug/google_E306801_html.html' → 'E306801' (doar capturile pe SKU, nu pe denumire)"""
+    name = os.path.basename(path)[len('google_'):-len('_html.html')]
+    return name if len(name) <= 20 else None
+
+
+def load_captures(directory=DEBUG_CAPTURES):
+    """{sku: html fără <script>} din capturile Google"""
+    captures = {}
+    for path in sorted(glob.glob(os.path.join(directory, 'google_*_html.html'))):
+        sku = capture_sku(path)
+        if sku:
+            with open(path, 'r', encoding='utf-8') as f:
+                captures[sku] = SCRIPT_RE.sub('', f.read())
+    return captures
+
+
+def norm(text):
+    return re.sub(r'[^a-z0-9]', '', text.lower())
+
+
+def with_overlay(page, overlay):
+    """Dialogul inserat imediat după <body>"""
+    return BODY_RE.sub(lambda m: m.group(0) + overlay, page, count=1)
+
+
+def scale_prices(page, factor):
+    """Prețurile 'x.xxx,yy RON/Lei' înmulțite cu factor, păstrând formatul românesc"""
+    def repl(m):
+        value = float(m.group(1).replace('.', '') + '.' + m.group(2)) * factor
+        whole, frac = f"{value:.2f}".split('.')
+        return f"{int(whole):,}".replace(',', '.') + ',' + frac + m.group(3)
+    return PRICE_RE.sub(repl, page)
+
+
+class StubEngine:
+    """Generatorul de pagini + comportamentul configurabil (latență, consimțământ, blocare)"""
+
+    def __init__(self, captures, latency_ms=0, jitter_ms=0, consent_rate=0.0, block_rate=0.0, seed=None):
+        self.captures = captures
+        self.keys = sorted(captures)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.consent_rate = consent_rate
+        self.block_rate = block_rate
+        self.random = random.Random(seed)
+        self.stats = {'google': 0, 'bing': 0, 'consent': 0, 'blocked': 0}
+        self._variants = {}
+        self._bing = {}
+
+    def query_sku(self, query):
+        """SKU-ul din interogare: o captură conținută în ea, altfel un SKU sintetic (SYN…) sau
+        ultimul token de tip cod produs; ultimul cuvânt doar dacă nu există niciunul"""
+        q = re.sub(r'\s+pret(\s+RON)?$', '', query.strip(), flags=re.IGNORECASE)
+        nq = norm(q)
+        for sku in self.keys:
+            if norm(sku) in nq:
+                return sku
+        m = SYNTHETIC_SKU_RE.search(q)
+        if m:
+            return m.group(0).upper()
+        words = [w.strip('"\'(),') for w in q.split()]
+        codes = [w for w in words if SKU_TOKEN_RE.match(w)]
+        if codes:
+            return codes[-1]
+        return words[-1] if words else ''
+
+    def google_page(self, sku):
+        """Captura SKU-ului sau o variantă sintetică deterministă pentru un SKU necunoscut"""
+        if sku in self.captures:
+            return self.captures[sku]
+        page = self._variants.get(sku)
+        if page is None:
+            h = zlib.crc32(sku.encode('utf-8'))
+            base = self.keys[h % len(self.keys)]
+            page = re.sub(re.escape(base), html.escape(sku), self.captures[base], flags=re.IGNORECASE)
+            page = scale_prices(page, 0.8 + (h >> 8) % 400 / 1000)
+            self._variants[sku] = page
+        return page
+
+    def bing_page(self, sku):
+        """Blocuri .b_algo din cardurile organice ale paginii Google corespunzătoare"""
+        if sku in self._bing:
+            return self._bing[sku]
+        doc = lxml.html.fromstring(self.google_page(sku))
+        blocks = []
+        for cite in doc.xpath('//cite'):
+            card = cite
+            for _ in range(20):
+                parent = card.getparent()
+                if parent is None:
+                    break
+                card = parent
+                if card.get('data-hveid') or card.get('data-rpos'):
+                    break
+            text = ' '.join(t.strip() for t in card.itertext() if t.strip())
+            url = cite.text_content().split(' ')[0]
+            blocks.append(f'<li class="b_algo"><div class="b_attribution"><cite>{html.escape(url)}</cite></div>'
+                          f'<p>{html.escape(text[:600])}</p></li>')
+            if len(blocks) >= BING_MAX_BLOCKS:
+                break
+        page = self._bing[sku] = f'<html><body><ol id="b_results">{"".join(blocks)}</ol></body></html>'
+        return page
+
+    def delay(self):
+        if self.latency_ms or self.jitter_ms:
+            time.sleep(max(0.0, self.latency_ms + self.random.uniform(-self.jitter_ms, self.jitter_ms)) / 1000)
+
+    def roll(self, rate):
+        return rate > 0 and self.random.random() < rate
+
+
+def create_app(engine):
+    app = Flask(__name__)
+
+    @app.route('/search')
+    def google_search():
+        engine.delay()
+        engine.stats['google'] += 1
+        if engine.roll(engine.block_rate):
+            engine.stats['blocked'] += 1
+            return redirect(f"/sorry/index?continue={request.full_path}")
+        page = engine.google_page(engine.query_sku(request.args.get('q', '')))
+        if 'CONSENT' not in request.cookies and engine.roll(engine.consent_rate):
+            engine.stats['consent'] += 1
+            page = with_overlay(page, GOOGLE_CONSENT_HTML)
+        return page
+
+    @app.route('/sorry/index')
+    def google_sorry():
+        return make_response(SORRY_HTML, 429)
+
+    @app.route('/bing/search')
+    def bing_search():
+        engine.delay()
+        engine.stats['bing'] += 1
+        if engine.roll(engine.block_rate):
+            engine.stats['blocked'] += 1
+            return make_response(SORRY_HTML, 429)
+        page = engine.bing_page(engine.query_sku(request.args.get('q', '')))
+        if 'BCONSENT' not in request.cookies and engine.roll(engine.consent_rate):
+            engine.stats['consent'] += 1
+            page = with_overlay(page, BING_CONSENT_HTML)
+        return page
+
+    @app.route('/stats')
+    def stub_stats():
+        return engine.stats
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description='PriceMonitor stub search engine')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=9000)
+    parser.add_argument('--captures', default=DEBUG_CAPTURES, help='director cu google_*_html.html')
+    parser.add_argument('--latency', type=float, default=300, help='latență medie per cerere (ms)')
+    parser.add_argument('--jitter', type=float, default=100, help='± variație a latenței (ms)')
+    parser.add_argument('--consent', type=float, default=0.0, help='fracțiunea de cereri fără cookie care primesc dialogul de consimțământ')
+    parser.add_argument('--block', type=float, default=0.0, help='fracțiunea de cereri blocate (/sorry/)')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    engine = StubEngine(load_captures(args.captures), args.latency, args.jitter, args.consent, args.block, args.seed)
+    print(f"🧪 Stub: {len(engine.captures)} capturi pe http://{args.host}:{args.port}")
+    create_app(engine).run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == '__main__':
+    main()
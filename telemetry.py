@@ -0,0 +1,161 @@
+"""PriceMonitor - telemetrie de resurse pentru browserele workerilor
+
+Fiecare worker (thread de scanare) își ține Chromium-ul între SKU-uri (BrowserHost în
+app.py) și raportează aici: RSS-ul arborelui de procese Chromium, paginile/contextele
+deschise, câte SKU-uri a scanat browserul curent și câte reporniri au fost.
+Un thread de fundal eșantionează RSS-ul periodic și îl scrie în log; pragurile de mai
+jos decid repornirea browserului între două SKU-uri. Heap-ul Python (tracemalloc)
+e urmărit doar la cerere, fiindcă încetinește alocările.
+"""
+import logging
+import os
+import threading
+import time
+import tracemalloc
+
+logger = logging.getLogger('PriceMonitor')
+
+BROWSER_MAX_RSS_MB = 1500     # Chromium (driver + browser + renderere) peste atât → repornire
+BROWSER_MAX_SKUS = 500        # repornire preventivă după atâtea SKU-uri pe același browser
+BROWSER_MAX_CONTEXTS = 1      # contexte rămase deschise după un SKU (normal 0) = scurgere → repornire
+TELEMETRY_INTERVAL = 60
+HEAP_TOP = 15
+
+
+def process_children():
+    """{ppid: [pid, ...]} pentru toate procesele, din /proc"""
+    children = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", 'r') as f:
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+    return children
+
+
+def descendants(pid, children=None):
+    children = process_children() if children is None else children
+    found = []
+    stack = list(children.get(pid, []))
+    while stack:
+        p = stack.pop()
+        found.append(p)
+        stack.extend(children.get(p, []))
+    return found
+
+
+def rss_mb(pid):
+    try:
+        with open(f"/proc/{pid}/status", 'r') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+def process_tree_rss(pid=None, children=None):
+    """RSS total (MB) al procesului și al tuturor descendenților (Chromium)"""
+    pid = pid or os.getpid()
+    return rss_mb(pid) + sum(rss_mb(p) for p in descendants(pid, children))
+
+
+class Telemetry:
+    """Registrul de browsere locale + ultimele rapoarte ale workerilor remote"""
+
+    def __init__(self, interval=TELEMETRY_INTERVAL, max_rss_mb=BROWSER_MAX_RSS_MB,
+                 max_skus=BROWSER_MAX_SKUS, max_contexts=BROWSER_MAX_CONTEXTS):
+        self.interval = interval
+        self.max_rss_mb = max_rss_mb
+        self.max_skus = max_skus
+        self.max_contexts = max_contexts
+        self.hosts = {}
+        self.remote = {}
+        self.lock = threading.Lock()
+        self._thread = None
+
+    def register(self, host):
+        with self.lock:
+            self.hosts[host.name] = host
+
+    def unregister(self, host):
+        with self.lock:
+            if self.hosts.get(host.name) is host:
+                del self.hosts[host.name]
+
+    def report(self, worker, sample):
+        """Eșantion trimis de un worker remote (odată cu rezultatul unui task)"""
+        with self.lock:
+            self.remote[worker] = {**sample, 'reported': time.time()}
+
+    def restart_reason(self, sample):
+        """Motivul pentru care browserul trebuie repornit, sau None"""
+        if self.max_rss_mb and sample['chromium_rss_mb'] > self.max_rss_mb:
+            return f"RSS {sample['chromium_rss_mb']:.0f} MB > {self.max_rss_mb}"
+        if self.max_skus and sample['skus'] >= self.max_skus:
+            return f"{sample['skus']} SKU-uri"
+        if self.max_contexts and sample.get('contexts', 0) >= self.max_contexts:
+            return f"{sample['contexts']} contexte deschise"
+        return None
+
+    def snapshot(self):
+        children = process_children()
+        with self.lock:
+            hosts = list(self.hosts.values())
+            remote = dict(self.remote)
+        return {
+            'python_rss_mb': round(rss_mb(os.getpid()), 1),
+            'process_tree_rss_mb': round(process_tree_rss(children=children), 1),
+            'tracemalloc': tracemalloc.is_tracing(),
+            'thresholds': {'max_rss_mb': self.max_rss_mb, 'max_skus': self.max_skus, 'max_contexts': self.max_contexts},
+            'workers': {h.name: h.sample(children) for h in hosts},
+            'remote': remote,
+        }
+
+    def log(self):
+        snap = self.snapshot()
+        for name, s in snap['workers'].items():
+            logger.info(f"   📈 {name}: Chromium {s['chromium_rss_mb']:.0f} MB, {s['pages']} pagini, "
+                        f"{s['contexts']} contexte, {s['skus']} SKU-uri, {s['restarts']} reporniri")
+        return snap
+
+    def start(self):
+        """Eșantionare periodică în log (RSS din /proc - nu atinge obiectele Playwright)"""
+        if self._thread or not self.interval:
+            return
+
+        def loop():
+            while True:
+                time.sleep(self.interval)
+                try:
+                    self.log()
+                except Exception as e:
+                    logger.info(f"   ⚠️ Telemetrie: {str(e)[:40]}")
+
+        self._thread = threading.Thread(target=loop, daemon=True)
+        self._thread.start()
+
+    def heap(self, action='snapshot', limit=HEAP_TOP):
+        """tracemalloc la cerere: start / snapshot (top alocări pe linie) / stop"""
+        if action == 'start':
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            return {'tracing': True}
+        if action == 'stop':
+            tracemalloc.stop()
+            return {'tracing': False}
+        if not tracemalloc.is_tracing():
+            return {'tracing': False, 'error': 'tracemalloc nepornit (?heap=start)'}
+        current, peak = tracemalloc.get_traced_memory()
+        stats = tracemalloc.take_snapshot().statistics('lineno')[:limit]
+        return {
+            'tracing': True,
+            'current_mb': round(current / 1048576, 2),
+            'peak_mb': round(peak / 1048576, 2),
+            'top': [{'where': str(s.traceback), 'size_kb': round(s.size / 1024, 1), 'count': s.count} for s in stats],
+        }
@@ -0,0 +1,138 @@
+"""PriceMonitor - worker de scanare
+
+Cere SKU-uri de la coordonator (app.py, /api/queue), rulează scan_product
+local și trimite rezultatele înapoi. Pornește câte un worker pe fiecare mașină/IP:
+
+    python worker.py --coordinator http://10.0.0.5:8080 --name box-2
+"""
+import argparse
+import json
+import socket
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from app import scan_product, proxy_pool, telemetry, logger, BrowserHost, SCAN_BUDGET
+
+HTTP_TIMEOUT = 30
+RESULT_RETRIES = 4        # coordonator indisponibil → reîncercări cu backoff 2, 4, 8, 16 s
+RESULT_BACKOFF = 2
+
+
+def call(coordinator, path, payload):
+    req = urllib.request.Request(f"{coordinator.rstrip('/')}{path}", data=json.dumps(payload).encode('utf-8'),
+                                 headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(req, timeout=HTTP_TIMEOUT) as res:
+        return json.loads(res.read())
+
+
+def keep_lease(coordinator, task_id, worker, interval, stop, lost):
+    """Prelungește lease-ul de la închiriere până la trimiterea rezultatului"""
+    while not stop.wait(interval):
+        try:
+            call(coordinator, f"/api/queue/{task_id}/extend", {'worker': worker})
+        except urllib.error.HTTPError as e:
+            logger.info(f"   ⚠️ Lease pierdut pentru task {task_id} ({e.code})")
+            lost.set()
+            return
+        except Exception as e:
+            logger.info(f"   ⚠️ Extend: {str(e)[:40]}")
+
+
+def start_lease(coordinator, task_id, worker, interval):
+    """(stop, lost) pentru thread-ul care ține lease-ul task-ului"""
+    stop, lost = threading.Event(), threading.Event()
+    threading.Thread(target=keep_lease, args=(coordinator, task_id, worker, interval, stop, lost), daemon=True).start()
+    return stop, lost
+
+
+def run_task(coordinator, worker, task, budget, host, stop):
+    payload = {'worker': worker}
+    try:
+        results = scan_product(task['sku'], task['name'] or '', task['price'] or 0, worker=worker, budget=budget, host=host)
+        payload['competitors'] = results
+        payload['partial'] = results.partial
+        payload['snapshot'] = results.snapshot
+    except Exception as e:
+        payload['error'] = str(e)[:200]
+    payload['telemetry'] = host.sample()
+    try:
+        post_result(coordinator, task, payload)
+    finally:
+        stop.set()
+
+
+def post_result(coordinator, task, payload):
+    """Trimite rezultatul; o cădere scurtă a coordonatorului nu oprește workerul.
+
+    Dacă renunțăm, lease-ul expiră și coordonatorul repune task-ul în coadă.
+    """
+    for attempt in range(RESULT_RETRIES + 1):
+        try:
+            call(coordinator, f"/api/queue/{task['id']}/result", payload)
+            return True
+        except urllib.error.HTTPError as e:
+            logger.info(f"   ⚠️ Rezultat respins pentru {task['sku']} ({e.code})")
+            return False
+        except Exception as e:
+            if attempt == RESULT_RETRIES:
+                logger.info(f"   ⚠️ Rezultat netrimis pentru {task['sku']}, renunț: {str(e)[:40]}")
+                return False
+            delay = RESULT_BACKOFF * 2 ** attempt
+            logger.info(f"   ⚠️ Rezultat {task['sku']}: {str(e)[:40]} - reîncerc în {delay}s")
+            time.sleep(delay)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='PriceMonitor scan worker')
+    parser.add_argument('--coordinator', default='http://127.0.0.1:8080')
+    parser.add_argument('--name', default=socket.gethostname())
+    parser.add_argument('--batch', type=int, default=1, help='câte task-uri cere o dată')
+    parser.add_argument('--idle', type=float, default=10, help='secunde de așteptare când coada e goală')
+    parser.add_argument('--pause', type=float, default=5, help='pauză între SKU-uri (ca în UI)')
+    parser.add_argument('--lease-interval', type=float, default=60, help='cât de des prelungim lease-ul')
+    parser.add_argument('--budget', type=float, default=SCAN_BUDGET, help='secunde per SKU (0 = fără limită)')
+    parser.add_argument('--once', action='store_true', help='ieși când coada e goală')
+    args = parser.parse_args()
+
+    logger.info(f"🛠️ Worker {args.name} → {args.coordinator}")
+    proxy_pool.start_health_checks()
+    telemetry.start()
+    # Un singur Chromium pentru toată viața workerului, repornit de pragurile din telemetry.py
+    host = BrowserHost(args.name)
+    try:
+        work(args, host)
+    finally:
+        host.shutdown()
+
+
+def work(args, host):
+    while True:
+        try:
+            tasks = call(args.coordinator, '/api/queue/lease', {'worker': args.name, 'n': args.batch})['tasks']
+        except Exception as e:
+            logger.info(f"   ⚠️ Coordonator indisponibil: {str(e)[:40]}")
+            time.sleep(args.idle)
+            continue
+        if not tasks:
+            if args.once:
+                break
+            time.sleep(args.idle)
+            continue
+        # Cu --batch N, toate task-urile din lot sunt prelungite de la închiriere, nu doar cel scanat
+        leases = [start_lease(args.coordinator, task['id'], args.name, args.lease_interval) for task in tasks]
+        try:
+            for task, (stop, lost) in zip(tasks, leases):
+                if lost.is_set():
+                    logger.info(f"   ⚠️ {task['sku']}: lease pierdut înainte de scanare - sărit")
+                    continue
+                run_task(args.coordinator, args.name, task, args.budget, host, stop)
+                time.sleep(args.pause)
+        finally:
+            for stop, _ in leases:
+                stop.set()
+
+
+if __name__ == '__main__':
+    main()